@@ -3,6 +3,7 @@ import os
 
 # Database Configuration
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "database", "momentum.db")
+DB_POOL_SIZE = int(os.environ.get("POOL_SIZE", 8))
 
 # Simulation Parameters
 MONTE_CARLO_ITERATIONS = 1000
@@ -3,34 +3,311 @@ Database manager for Momentum simulation.
 Handles database initialization, CRUD operations, and data integrity.
 """
 
+import queue
 import sqlite3
 import json
+import numpy as np
+from cachetools import TTLCache
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 from pathlib import Path
-from .models import Driver, Team, Track, Championship, Race, RaceResult, SCHEMA_SQL
-from ..config import DATABASE_PATH
+from .models import (Driver, Team, Track, Championship, Race, RaceResult, SCHEMA_SQL,
+                     Discipline, Tier, Surface, DRIVER_COLS, make_driver)
+from config import DATABASE_PATH, DB_POOL_SIZE
+
+# APSW binds directly to the SQLite C API and yields native tuples without
+# the stdlib's row-converter layer, which matters on bulk dumps. It is
+# optional: everything falls back to the pooled sqlite3 connections.
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+# Performance pragmas applied to every connection. WAL + synchronous=NORMAL
+# cut fsync cost dramatically for the frequent result/stat writes; the
+# journal mode persists in the database file but is cheap to re-issue.
+PRAGMA_SQL = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+"""
+
+# Explicit column lists in dataclass field order, so rows construct
+# positionally and schema-only columns like created_at stay out of the way
+_DRIVER_COLUMNS = ", ".join(DRIVER_COLS)
+_TEAM_COLUMNS = ("id, name, nationality, founded_year, discipline_id, tier_id, budget, "
+                 "headquarters, team_principal, biography, total_wins, total_podiums, "
+                 "championships")
+_TRACK_COLUMNS = ("id, name, country, length_km, surface_type_id, difficulty, weather_impact, "
+                  "overtaking_difficulty, discipline_id, lap_record_time, description")
+_CHAMPIONSHIP_COLUMNS = ("id, name, discipline_id, tier_id, season_length, points_system, "
+                         "current_season, founded_year, description")
+_RACE_RESULT_COLUMNS = ("race_id, driver_id, team_id, position, points, fastest_lap, "
+                        "dnf_reason, grid_position")
+
+
+# Enumerated columns are stored as INTEGER lookup ids (see models._Lookup);
+# these helpers decode them back to the strings the dataclasses carry.
+
+def _team_from_row(row) -> Team:
+    vals = list(row)
+    vals[4] = Discipline(vals[4]).label
+    vals[5] = Tier(vals[5]).label
+    return Team(*vals)
+
+
+def _track_from_row(row) -> Track:
+    vals = list(row)
+    vals[4] = Surface(vals[4]).label
+    vals[8] = Discipline(vals[8]).label
+    return Track(*vals)
+
+
+def _championship_from_row(row) -> Championship:
+    vals = list(row)
+    vals[2] = Discipline(vals[2]).label
+    vals[3] = Tier(vals[3]).label
+    return Championship(*vals)
+
+# Health probes hit /stats constantly and COUNT(*) is a table scan in
+# SQLite; cache the answer briefly, keyed per database path. Write paths
+# clear it via invalidate_caches().
+_stats_cache: TTLCache = TTLCache(maxsize=8, ttl=5)
+
+# Readiness probes only need to know the database answers at all; remember
+# a successful SELECT 1 for a couple of seconds per database path
+_ping_cache: TTLCache = TTLCache(maxsize=8, ttl=2)
+
+# Older schemas stored discipline/tier/surface_type as TEXT columns with
+# CHECK constraints instead of INTEGER lookup ids. Databases created that
+# way are migrated in place on startup: the presence of the old TEXT
+# column identifies a legacy table, the table is parked under a _legacy_
+# name, SCHEMA_SQL recreates it with id columns, and the copy statements
+# below backfill the ids by joining the lookup tables on the old labels.
+_LEGACY_ENUM_COLUMNS = {
+    "teams": "discipline",
+    "tracks": "surface_type",
+    "championships": "discipline",
+}
+
+_LEGACY_COPY_SQL = {
+    "teams": """
+        INSERT INTO teams (id, name, nationality, founded_year, discipline_id, tier_id,
+                           budget, headquarters, team_principal, biography,
+                           total_wins, total_podiums, championships, created_at)
+        SELECT l.id, l.name, l.nationality, l.founded_year, d.id, t.id,
+               l.budget, l.headquarters, l.team_principal, l.biography,
+               l.total_wins, l.total_podiums, l.championships, l.created_at
+        FROM _legacy_teams l
+        JOIN disciplines d ON d.name = l.discipline
+        JOIN tiers t ON t.name = l.tier
+    """,
+    "tracks": """
+        INSERT INTO tracks (id, name, country, length_km, surface_type_id, difficulty,
+                            weather_impact, overtaking_difficulty, discipline_id,
+                            lap_record_time, description, created_at)
+        SELECT l.id, l.name, l.country, l.length_km, s.id, l.difficulty,
+               l.weather_impact, l.overtaking_difficulty, d.id,
+               l.lap_record_time, l.description, l.created_at
+        FROM _legacy_tracks l
+        JOIN surface_types s ON s.name = l.surface_type
+        JOIN disciplines d ON d.name = l.discipline
+    """,
+    "championships": """
+        INSERT INTO championships (id, name, discipline_id, tier_id, season_length,
+                                   points_system, current_season, founded_year,
+                                   description, created_at)
+        SELECT l.id, l.name, d.id, t.id, l.season_length,
+               l.points_system, l.current_season, l.founded_year,
+               l.description, l.created_at
+        FROM _legacy_championships l
+        JOIN disciplines d ON d.name = l.discipline
+        JOIN tiers t ON t.name = l.tier
+    """,
+}
+
+
+def _legacy_enum_tables(conn: sqlite3.Connection) -> List[str]:
+    """Tables in this database still carrying the pre-lookup TEXT columns"""
+    return [table for table, column in _LEGACY_ENUM_COLUMNS.items()
+            if any(row[1] == column
+                   for row in conn.execute(f"PRAGMA table_info({table})"))]
+
+# Structured dtype for bulk driver loads; C-contiguous and directly usable
+# by the vectorized simulation code without per-row dataclass objects
+DRIVER_DTYPE = np.dtype([
+    ('id', 'i4'), ('name', 'U64'),
+    ('skill', 'f4'), ('consistency', 'f4'), ('aggression', 'f4'),
+    ('racecraft', 'f4'), ('adaptability', 'f4'),
+    ('career_wins', 'i4'), ('career_podiums', 'i4'), ('career_points', 'i4'),
+])
+
+
+# Drivers, teams and tracks are immutable for the duration of a race but get
+# fetched repeatedly during simulation, so memoize the raw row lookups at
+# module scope. Write paths call DatabaseManager.invalidate_caches().
+
+@lru_cache(maxsize=1024)
+def _fetch_driver(db_path: str, driver_id: int) -> Optional[tuple]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f"SELECT {_DRIVER_COLUMNS} FROM drivers WHERE id = ?", (driver_id,)).fetchone()
+
+
+@lru_cache(maxsize=1024)
+def _fetch_team(db_path: str, team_id: int) -> Optional[tuple]:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(
+            f"SELECT {_TEAM_COLUMNS} FROM teams WHERE id = ?", (team_id,)).fetchone()
+
+
+@lru_cache(maxsize=64)
+def _fetch_tracks_by_discipline(db_path: str, discipline: str) -> tuple:
+    with sqlite3.connect(db_path) as conn:
+        return tuple(conn.execute(
+            f"SELECT {_TRACK_COLUMNS} FROM tracks WHERE discipline_id = ? ORDER BY name",
+            (Discipline.from_label(discipline).value,)).fetchall())
+
+
+class SQLitePool:
+    """Bounded pool of persistent SQLite connections.
+
+    FastAPI serves requests from a thread pool, so a single shared
+    connection serializes all database work. With WAL enabled, pooled
+    connections let readers run concurrently while writers queue.
+    """
+
+    def __init__(self, db_path: str, size: int = DB_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._pool: queue.Queue = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._new_connection())
+
+    def _new_connection(self) -> sqlite3.Connection:
+        # cached_statements above the default 128 so every hot statement
+        # stays prepared for the connection's lifetime; IMMEDIATE makes
+        # write transactions (batch result inserts) take the write lock up
+        # front instead of failing mid-transaction on an upgrade
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=256, isolation_level="IMMEDIATE")
+        conn.row_factory = sqlite3.Row
+        conn.executescript(PRAGMA_SQL)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success, rolls back on error"""
+        conn = self._pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Close every pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
 
 class DatabaseManager:
     """Manages all database operations for Momentum simulation"""
-    
-    def __init__(self, db_path: str = DATABASE_PATH):
+
+    # Hot statements as stable constants: identical strings hash-hit the
+    # sqlite3 per-connection statement cache, skipping re-parse/re-plan
+    _SQL_DRIVERS_ALL = f"SELECT {_DRIVER_COLUMNS} FROM drivers ORDER BY name"
+    # INDEXED BY pins the planner to the composite (discipline, tier, id)
+    # index so combined discipline/tier scans stay on it as the table grows
+    _SQL_TEAMS_BY_DISCIPLINE = (f"SELECT {_TEAM_COLUMNS} FROM teams "
+                                "INDEXED BY idx_teams_disc_tier "
+                                "WHERE discipline_id = ? ORDER BY tier_id, name")
+    _SQL_RACE_RESULTS = (f"SELECT {_RACE_RESULT_COLUMNS} FROM race_results "
+                         "WHERE race_id = ? ORDER BY position")
+    _SQL_STANDINGS = """
+        SELECT d.name as driver_name, t.name as team_name,
+               SUM(rr.points) as total_points,
+               COUNT(CASE WHEN rr.position = 1 THEN 1 END) as wins,
+               COUNT(CASE WHEN rr.position <= 3 THEN 1 END) as podiums
+        FROM race_results rr
+        JOIN races r ON rr.race_id = r.id
+        JOIN drivers d ON rr.driver_id = d.id
+        JOIN teams t ON rr.team_id = t.id
+        WHERE r.championship_id = ? AND r.season = ?
+        GROUP BY rr.driver_id, rr.team_id
+        ORDER BY total_points DESC, wins DESC
+    """
+
+    def __init__(self, db_path: str = DATABASE_PATH, pool_size: int = DB_POOL_SIZE):
         self.db_path = db_path
         self.init_database()
-    
+        self._pool = SQLitePool(db_path, size=pool_size)
+        self._apsw_conn = None  # lazy; created on first bulk read
+
+    def _apsw_cursor(self):
+        """Cursor on a persistent APSW connection for zero-copy bulk reads"""
+        if self._apsw_conn is None:
+            conn = apsw.Connection(self.db_path)
+            conn.setbusytimeout(5000)
+            conn.cursor().execute(PRAGMA_SQL)
+            self._apsw_conn = conn
+        return self._apsw_conn.cursor()
+
     def init_database(self):
         """Initialize database with schema if it doesn't exist"""
         # Ensure directory exists
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-        
+
         with sqlite3.connect(self.db_path) as conn:
+            # Must run before the first table is created to take effect;
+            # 8 KiB pages halve the page count mmap reads walk through.
+            # Existing databases keep their page size (changing it needs
+            # a VACUUM) and are unaffected.
+            conn.execute("PRAGMA page_size=8192")
+            legacy_tables = _legacy_enum_tables(conn)
+            if legacy_tables:
+                # Park legacy TEXT-column tables so SCHEMA_SQL can create
+                # their id-column replacements. legacy_alter_table keeps
+                # the rename from rewriting foreign keys in other tables
+                # to point at the parked copies.
+                conn.execute("PRAGMA legacy_alter_table=ON")
+                for table in legacy_tables:
+                    conn.execute(f"ALTER TABLE {table} RENAME TO _legacy_{table}")
+                conn.execute("PRAGMA legacy_alter_table=OFF")
             conn.executescript(SCHEMA_SQL)
+            if legacy_tables:
+                for table in legacy_tables:
+                    conn.executescript(_LEGACY_COPY_SQL[table])
+                    conn.execute(f"DROP TABLE _legacy_{table}")
+                # Dropping a parked table takes its same-named indexes
+                # with it; a second schema pass recreates them
+                conn.executescript(SCHEMA_SQL)
+            conn.executescript(PRAGMA_SQL)
+            # Refresh planner statistics so the covering indexes get picked
+            conn.execute("ANALYZE")
             conn.commit()
-    
-    def get_connection(self) -> sqlite3.Connection:
-        """Get database connection with row factory"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+
+    def get_connection(self):
+        """Borrow a pooled connection; use as `with self.get_connection() as conn:`"""
+        return self._pool.connection()
+
+    def close(self):
+        """Release all pooled connections"""
+        self._pool.close()
+        if self._apsw_conn is not None:
+            self._apsw_conn.close()
+            self._apsw_conn = None
+
+    def __del__(self):
+        if hasattr(self, "_pool"):
+            self.close()
     
     # Driver operations
     def create_driver(self, driver: Driver) -> int:
@@ -41,24 +318,47 @@ class DatabaseManager:
                                    aggression, racecraft, adaptability, biography)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (driver.name, driver.nationality, driver.birth_date, driver.skill,
-                  driver.consistency, driver.aggression, driver.racecraft, 
+                  driver.consistency, driver.aggression, driver.racecraft,
                   driver.adaptability, driver.biography))
+            self.invalidate_caches()
             return cursor.lastrowid
     
     def get_driver(self, driver_id: int) -> Optional[Driver]:
-        """Get driver by ID"""
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM drivers WHERE id = ?", (driver_id,)).fetchone()
-            if row:
-                return Driver(**dict(row))
-            return None
-    
+        """Get driver by ID (memoized)"""
+        row = _fetch_driver(self.db_path, driver_id)
+        if row:
+            return make_driver(row)
+        return None
+
     def get_all_drivers(self) -> List[Driver]:
         """Get all drivers"""
         with self.get_connection() as conn:
-            rows = conn.execute("SELECT * FROM drivers ORDER BY name").fetchall()
-            return [Driver(**dict(row)) for row in rows]
+            rows = conn.execute(self._SQL_DRIVERS_ALL).fetchall()
+            return [make_driver(row) for row in rows]
+
+    def iter_drivers(self):
+        """Yield drivers one row at a time, for streaming endpoints"""
+        with self.get_connection() as conn:
+            for row in conn.execute(self._SQL_DRIVERS_ALL):
+                yield make_driver(row)
     
+    _SQL_DRIVERS_ARRAY = """
+        SELECT id, name, skill, consistency, aggression, racecraft, adaptability,
+               career_wins, career_podiums, career_points
+        FROM drivers ORDER BY id
+    """
+
+    def get_all_drivers_array(self) -> np.ndarray:
+        """Bulk-load driver attributes into a structured NumPy array"""
+        if APSW_AVAILABLE:
+            # APSW cursors yield plain tuples straight from the C API, so
+            # rows feed np.fromiter without the sqlite3 Row detour
+            return np.fromiter(self._apsw_cursor().execute(self._SQL_DRIVERS_ARRAY),
+                               dtype=DRIVER_DTYPE)
+        with self.get_connection() as conn:
+            cursor = conn.execute(self._SQL_DRIVERS_ARRAY)
+            return np.fromiter(map(tuple, cursor), dtype=DRIVER_DTYPE)
+
     def update_driver_stats(self, driver_id: int, wins: int = 0, podiums: int = 0, points: int = 0):
         """Update driver career statistics"""
         with self.get_connection() as conn:
@@ -69,77 +369,114 @@ class DatabaseManager:
                     career_points = career_points + ?
                 WHERE id = ?
             """, (wins, podiums, points, driver_id))
+        self.invalidate_caches()
     
     # Team operations
     def create_team(self, team: Team) -> int:
         """Create a new team and return ID"""
         with self.get_connection() as conn:
             cursor = conn.execute("""
-                INSERT INTO teams (name, nationality, founded_year, discipline, tier,
+                INSERT INTO teams (name, nationality, founded_year, discipline_id, tier_id,
                                  budget, headquarters, team_principal, biography)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (team.name, team.nationality, team.founded_year, team.discipline,
-                  team.tier, team.budget, team.headquarters, team.team_principal, team.biography))
+            """, (team.name, team.nationality, team.founded_year,
+                  Discipline.from_label(team.discipline).value, Tier.from_label(team.tier).value,
+                  team.budget, team.headquarters, team.team_principal, team.biography))
+            self.invalidate_caches()
             return cursor.lastrowid
     
     def get_team(self, team_id: int) -> Optional[Team]:
-        """Get team by ID"""
-        with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM teams WHERE id = ?", (team_id,)).fetchone()
-            if row:
-                return Team(**dict(row))
-            return None
-    
+        """Get team by ID (memoized)"""
+        row = _fetch_team(self.db_path, team_id)
+        if row:
+            return _team_from_row(row)
+        return None
+
     def get_teams_by_discipline(self, discipline: str) -> List[Team]:
         """Get all teams in a specific discipline"""
+        with self.get_connection() as conn:
+            rows = conn.execute(self._SQL_TEAMS_BY_DISCIPLINE,
+                                (Discipline.from_label(discipline).value,)).fetchall()
+            return [_team_from_row(row) for row in rows]
+
+    def get_all_teams(self) -> List[Team]:
+        """Get all teams across every discipline"""
         with self.get_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM teams WHERE discipline = ? ORDER BY tier, name", 
-                (discipline,)
-            ).fetchall()
-            return [Team(**dict(row)) for row in rows]
+                f"SELECT {_TEAM_COLUMNS} FROM teams ORDER BY tier_id, name").fetchall()
+            return [_team_from_row(row) for row in rows]
+
+    def iter_teams(self):
+        """Yield all teams one row at a time, for streaming endpoints"""
+        with self.get_connection() as conn:
+            for row in conn.execute(
+                    f"SELECT {_TEAM_COLUMNS} FROM teams ORDER BY tier_id, name"):
+                yield _team_from_row(row)
+
+    def iter_teams_by_discipline(self, discipline: str):
+        """Yield teams in a discipline one row at a time, for streaming endpoints"""
+        with self.get_connection() as conn:
+            for row in conn.execute(self._SQL_TEAMS_BY_DISCIPLINE,
+                                    (Discipline.from_label(discipline).value,)):
+                yield _team_from_row(row)
     
     # Track operations
     def create_track(self, track: Track) -> int:
         """Create a new track and return ID"""
         with self.get_connection() as conn:
             cursor = conn.execute("""
-                INSERT INTO tracks (name, country, length_km, surface_type, difficulty,
-                                  weather_impact, overtaking_difficulty, discipline, description)
+                INSERT INTO tracks (name, country, length_km, surface_type_id, difficulty,
+                                  weather_impact, overtaking_difficulty, discipline_id, description)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (track.name, track.country, track.length_km, track.surface_type,
+            """, (track.name, track.country, track.length_km,
+                  Surface.from_label(track.surface_type).value,
                   track.difficulty, track.weather_impact, track.overtaking_difficulty,
-                  track.discipline, track.description))
+                  Discipline.from_label(track.discipline).value, track.description))
+            self.invalidate_caches()
             return cursor.lastrowid
     
     def get_tracks_by_discipline(self, discipline: str) -> List[Track]:
-        """Get all tracks for a specific discipline"""
+        """Get all tracks for a specific discipline (memoized)"""
+        rows = _fetch_tracks_by_discipline(self.db_path, discipline)
+        return [_track_from_row(row) for row in rows]
+
+    def get_all_tracks(self) -> List[Track]:
+        """Get all tracks across every discipline"""
         with self.get_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM tracks WHERE discipline = ? ORDER BY name", 
-                (discipline,)
-            ).fetchall()
-            return [Track(**dict(row)) for row in rows]
+                f"SELECT {_TRACK_COLUMNS} FROM tracks ORDER BY name").fetchall()
+            return [_track_from_row(row) for row in rows]
+
+    def invalidate_caches(self):
+        """Drop memoized lookups after writes so reads never go stale"""
+        _fetch_driver.cache_clear()
+        _fetch_team.cache_clear()
+        _fetch_tracks_by_discipline.cache_clear()
+        _stats_cache.clear()
     
     # Championship operations
     def create_championship(self, championship: Championship) -> int:
         """Create a new championship and return ID"""
         with self.get_connection() as conn:
             cursor = conn.execute("""
-                INSERT INTO championships (name, discipline, tier, season_length,
+                INSERT INTO championships (name, discipline_id, tier_id, season_length,
                                          points_system, current_season, founded_year, description)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (championship.name, championship.discipline, championship.tier,
+            """, (championship.name, Discipline.from_label(championship.discipline).value,
+                  Tier.from_label(championship.tier).value,
                   championship.season_length, championship.points_system,
                   championship.current_season, championship.founded_year, championship.description))
+            self.invalidate_caches()
             return cursor.lastrowid
     
     def get_championship(self, championship_id: int) -> Optional[Championship]:
         """Get championship by ID"""
         with self.get_connection() as conn:
-            row = conn.execute("SELECT * FROM championships WHERE id = ?", (championship_id,)).fetchone()
+            row = conn.execute(
+                f"SELECT {_CHAMPIONSHIP_COLUMNS} FROM championships WHERE id = ?",
+                (championship_id,)).fetchone()
             if row:
-                return Championship(**dict(row))
+                return _championship_from_row(row)
             return None
     
     # Race operations
@@ -152,54 +489,67 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (race.championship_id, race.track_id, race.season, race.round_number,
                   race.race_date, race.weather_conditions, race.race_duration_minutes, race.status))
+            self.invalidate_caches()
             return cursor.lastrowid
     
     def get_race_results(self, race_id: int) -> List[RaceResult]:
         """Get all results for a specific race"""
         with self.get_connection() as conn:
-            rows = conn.execute("""
-                SELECT * FROM race_results 
-                WHERE race_id = ? 
-                ORDER BY position
-            """, (race_id,)).fetchall()
-            return [RaceResult(**dict(row)) for row in rows]
-    
-    def save_race_result(self, result: RaceResult) -> int:
-        """Save race result and return ID"""
+            rows = conn.execute(self._SQL_RACE_RESULTS, (race_id,)).fetchall()
+            return [RaceResult(*row) for row in rows]
+
+    def save_race_result(self, result: RaceResult):
+        """Save a single race result (upsert on its (race_id, driver_id) key)"""
         with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT OR REPLACE INTO race_results 
-                (race_id, driver_id, team_id, position, points, fastest_lap, dnf_reason, grid_position)
+            conn.execute(f"""
+                INSERT OR REPLACE INTO race_results
+                ({_RACE_RESULT_COLUMNS})
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """, (result.race_id, result.driver_id, result.team_id, result.position,
                   result.points, result.fastest_lap, result.dnf_reason, result.grid_position))
-            return cursor.lastrowid
-    
+            self.invalidate_caches()
+
+    def save_race_results(self, results: List[RaceResult]):
+        """Save a batch of race results in a single transaction"""
+        # executemany inside one commit instead of one transaction per row;
+        # this is the path to use after simulating a full race
+        rows = [(r.race_id, r.driver_id, r.team_id, r.position, r.points,
+                 r.fastest_lap, r.dnf_reason, r.grid_position) for r in results]
+        with self.get_connection() as conn:
+            conn.executemany(f"""
+                INSERT OR REPLACE INTO race_results
+                ({_RACE_RESULT_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        self.invalidate_caches()
+
     # Statistics and queries
     def get_championship_standings(self, championship_id: int, season: int) -> List[Dict[str, Any]]:
         """Get current championship standings for a season"""
         with self.get_connection() as conn:
-            rows = conn.execute("""
-                SELECT d.name as driver_name, t.name as team_name,
-                       SUM(rr.points) as total_points,
-                       COUNT(CASE WHEN rr.position = 1 THEN 1 END) as wins,
-                       COUNT(CASE WHEN rr.position <= 3 THEN 1 END) as podiums
-                FROM race_results rr
-                JOIN races r ON rr.race_id = r.id
-                JOIN drivers d ON rr.driver_id = d.id
-                JOIN teams t ON rr.team_id = t.id
-                WHERE r.championship_id = ? AND r.season = ?
-                GROUP BY rr.driver_id, rr.team_id
-                ORDER BY total_points DESC, wins DESC
-            """, (championship_id, season)).fetchall()
-            
+            rows = conn.execute(self._SQL_STANDINGS, (championship_id, season)).fetchall()
+
             return [dict(row) for row in rows]
     
+    def ping(self) -> bool:
+        """Trivial readiness check: SELECT 1, cached for a couple of seconds"""
+        if self.db_path in _ping_cache:
+            return True
+        with self.get_connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+        _ping_cache[self.db_path] = True
+        return True
+
     def get_database_stats(self) -> Dict[str, int]:
-        """Get database statistics"""
+        """Get database statistics (cached for a few seconds)"""
+        cached = _stats_cache.get(self.db_path)
+        if cached is not None:
+            return cached
+
         with self.get_connection() as conn:
             stats = {}
             for table in ['drivers', 'teams', 'tracks', 'championships', 'races', 'race_results']:
                 count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
                 stats[table] = count
+            _stats_cache[self.db_path] = stats
             return stats
\ No newline at end of file
@@ -3,12 +3,73 @@ SQLite database models for Momentum motorsport simulation.
 Defines the schema for teams, drivers, tracks, championships, and historical data.
 """
 
+import json
 import sqlite3
 from dataclasses import dataclass
+from enum import IntEnum
+from functools import lru_cache
 from typing import Optional, List, Dict
 from datetime import datetime
 
-@dataclass
+import numpy as np
+
+class _Lookup(IntEnum):
+    """Enumerated value stored as an INTEGER foreign key instead of TEXT.
+
+    The database keeps 4-byte ids (denser index keys, integer compares on
+    insert); the dataclasses keep the human-readable strings. The
+    DatabaseManager translates at its boundary via from_label()/label.
+    """
+
+    @classmethod
+    def from_label(cls, label: str) -> "_Lookup":
+        try:
+            return cls[label.upper()]
+        except KeyError:
+            raise ValueError(
+                f"unknown {cls.__name__.lower()} {label!r}; "
+                f"expected one of {[m.label for m in cls]}") from None
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+class Discipline(_Lookup):
+    FORMULA = 1
+    RALLY = 2
+    ENDURANCE = 3
+    STREET = 4
+
+class Tier(_Lookup):
+    TIER1 = 1
+    TIER2 = 2
+    TIER3 = 3
+
+class Surface(_Lookup):
+    TARMAC = 1
+    GRAVEL = 2
+    MIXED = 3
+
+@lru_cache(maxsize=32)
+def _compile_points_table(points_system: str) -> np.ndarray:
+    """Parse a points_system JSON string into an int16 per-position table.
+
+    Cached on the JSON text, so each championship's system is parsed once
+    regardless of how many results are scored against it. Accepts either a
+    list ([25, 18, ...]) or a position-keyed object ({"1": 25, ...}).
+    """
+    spec = json.loads(points_system)
+    if isinstance(spec, dict):
+        spec = [spec.get(str(pos), 0) for pos in range(1, max(map(int, spec)) + 1)]
+    return np.asarray(spec, dtype=np.int16)
+
+def points_for_positions(positions: np.ndarray, table: np.ndarray) -> np.ndarray:
+    """Vectorized points lookup; positions beyond the table score zero"""
+    idx = np.asarray(positions, dtype=np.int64) - 1
+    in_range = (idx >= 0) & (idx < len(table))
+    return np.where(in_range, table[np.clip(idx, 0, len(table) - 1)], 0).astype(np.int16)
+
+@dataclass(slots=True)
 class Driver:
     """Driver entity with attributes and historical data"""
     id: int
@@ -26,7 +87,18 @@ class Driver:
     biography: str = ""
     current_team_id: Optional[int] = None
 
-@dataclass
+# SELECT column order for driver reads, matching the dataclass fields.
+# make_driver is generated source ("lambda r: Driver(r[0], r[1], ...)") so
+# each row becomes a Driver in one positional call with no per-field
+# Python loop or kwargs dict.
+DRIVER_COLS = ('id', 'name', 'nationality', 'birth_date', 'skill', 'consistency',
+               'aggression', 'racecraft', 'adaptability', 'career_wins',
+               'career_podiums', 'career_points', 'biography', 'current_team_id')
+make_driver = eval(
+    "lambda r: Driver(" + ", ".join(f"r[{i}]" for i in range(len(DRIVER_COLS))) + ")",
+    {"Driver": Driver})
+
+@dataclass(slots=True)
 class Team:
     """Team entity with financial and operational data"""
     id: int
@@ -43,7 +115,7 @@ class Team:
     total_podiums: int = 0
     championships: int = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Track:
     """Racing track/circuit with characteristics"""
     id: int
@@ -58,7 +130,7 @@ class Track:
     lap_record_time: Optional[str] = None
     description: str = ""
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Championship:
     """Championship/League definition"""
     id: int
@@ -71,7 +143,16 @@ class Championship:
     founded_year: int
     description: str = ""
 
-@dataclass
+    def compile_points_table(self) -> np.ndarray:
+        """Points per finishing position as an int16 array (parsed once)"""
+        return _compile_points_table(self.points_system)
+
+    def points_for(self, position: int) -> int:
+        """Points awarded for a single finishing position"""
+        table = self.compile_points_table()
+        return int(table[position - 1]) if 0 < position <= len(table) else 0
+
+@dataclass(slots=True, frozen=True)
 class Race:
     """Individual race instance"""
     id: int
@@ -84,10 +165,9 @@ class Race:
     race_duration_minutes: int
     status: str  # scheduled, completed, cancelled
 
-@dataclass
+@dataclass(slots=True)
 class RaceResult:
-    """Race result for a driver"""
-    id: int
+    """Race result for a driver, keyed by (race_id, driver_id)"""
     race_id: int
     driver_id: int
     team_id: int
@@ -99,6 +179,30 @@ class RaceResult:
 
 # Database Schema Creation SQL
 SCHEMA_SQL = """
+-- Lookup tables: enumerated TEXT columns are stored as INTEGER ids
+-- (see the _Lookup enums); these tables document the mapping and give
+-- the ids a foreign key to point at
+CREATE TABLE IF NOT EXISTS disciplines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+INSERT OR IGNORE INTO disciplines (id, name) VALUES
+    (1, 'formula'), (2, 'rally'), (3, 'endurance'), (4, 'street');
+
+CREATE TABLE IF NOT EXISTS tiers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+INSERT OR IGNORE INTO tiers (id, name) VALUES
+    (1, 'tier1'), (2, 'tier2'), (3, 'tier3');
+
+CREATE TABLE IF NOT EXISTS surface_types (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+INSERT OR IGNORE INTO surface_types (id, name) VALUES
+    (1, 'tarmac'), (2, 'gravel'), (3, 'mixed');
+
 -- Drivers table
 CREATE TABLE IF NOT EXISTS drivers (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -125,8 +229,8 @@ CREATE TABLE IF NOT EXISTS teams (
     name TEXT NOT NULL UNIQUE,
     nationality TEXT NOT NULL,
     founded_year INTEGER NOT NULL,
-    discipline TEXT NOT NULL CHECK(discipline IN ('formula', 'rally', 'endurance', 'street')),
-    tier TEXT NOT NULL CHECK(tier IN ('tier1', 'tier2', 'tier3')),
+    discipline_id INTEGER NOT NULL REFERENCES disciplines(id),
+    tier_id INTEGER NOT NULL REFERENCES tiers(id),
     budget REAL NOT NULL,
     headquarters TEXT NOT NULL,
     team_principal TEXT NOT NULL,
@@ -143,11 +247,11 @@ CREATE TABLE IF NOT EXISTS tracks (
     name TEXT NOT NULL,
     country TEXT NOT NULL,
     length_km REAL NOT NULL,
-    surface_type TEXT NOT NULL CHECK(surface_type IN ('tarmac', 'gravel', 'mixed')),
+    surface_type_id INTEGER NOT NULL REFERENCES surface_types(id),
     difficulty REAL NOT NULL CHECK(difficulty >= 0.0 AND difficulty <= 1.0),
     weather_impact REAL NOT NULL CHECK(weather_impact >= 0.0 AND weather_impact <= 1.0),
     overtaking_difficulty REAL NOT NULL CHECK(overtaking_difficulty >= 0.0 AND overtaking_difficulty <= 1.0),
-    discipline TEXT NOT NULL CHECK(discipline IN ('formula', 'rally', 'endurance', 'street')),
+    discipline_id INTEGER NOT NULL REFERENCES disciplines(id),
     lap_record_time TEXT,
     description TEXT DEFAULT '',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
@@ -157,8 +261,8 @@ CREATE TABLE IF NOT EXISTS tracks (
 CREATE TABLE IF NOT EXISTS championships (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT NOT NULL UNIQUE,
-    discipline TEXT NOT NULL CHECK(discipline IN ('formula', 'rally', 'endurance', 'street')),
-    tier TEXT NOT NULL CHECK(tier IN ('tier1', 'tier2', 'tier3')),
+    discipline_id INTEGER NOT NULL REFERENCES disciplines(id),
+    tier_id INTEGER NOT NULL REFERENCES tiers(id),
     season_length INTEGER NOT NULL,
     points_system TEXT NOT NULL, -- JSON string
     current_season INTEGER NOT NULL,
@@ -184,9 +288,10 @@ CREATE TABLE IF NOT EXISTS races (
     UNIQUE(championship_id, season, round_number)
 );
 
--- Race results table
+-- Race results table. (race_id, driver_id) is the natural key, so the
+-- table is WITHOUT ROWID: rows live directly in the primary-key B-tree
+-- and bulk inserts skip the hidden rowid tree entirely
 CREATE TABLE IF NOT EXISTS race_results (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
     race_id INTEGER NOT NULL,
     driver_id INTEGER NOT NULL,
     team_id INTEGER NOT NULL,
@@ -196,17 +301,23 @@ CREATE TABLE IF NOT EXISTS race_results (
     dnf_reason TEXT,
     grid_position INTEGER DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (race_id, driver_id),
     FOREIGN KEY (race_id) REFERENCES races (id),
     FOREIGN KEY (driver_id) REFERENCES drivers (id),
-    FOREIGN KEY (team_id) REFERENCES teams (id),
-    UNIQUE(race_id, driver_id)
-);
+    FOREIGN KEY (team_id) REFERENCES teams (id)
+) WITHOUT ROWID;
 
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_drivers_team ON drivers(current_team_id);
-CREATE INDEX IF NOT EXISTS idx_teams_discipline ON teams(discipline);
-CREATE INDEX IF NOT EXISTS idx_tracks_discipline ON tracks(discipline);
+CREATE INDEX IF NOT EXISTS idx_teams_discipline ON teams(discipline_id);
+CREATE INDEX IF NOT EXISTS idx_tracks_discipline ON tracks(discipline_id);
 CREATE INDEX IF NOT EXISTS idx_races_championship_season ON races(championship_id, season);
-CREATE INDEX IF NOT EXISTS idx_race_results_race ON race_results(race_id);
 CREATE INDEX IF NOT EXISTS idx_race_results_driver ON race_results(driver_id);
+
+-- Covering indexes: hot SELECTs (results by race, standings by driver) are
+-- answered from the index alone without fetching table rows
+CREATE INDEX IF NOT EXISTS idx_rr_race_pos ON race_results(race_id, position, driver_id, team_id, points);
+CREATE INDEX IF NOT EXISTS idx_rr_driver_points ON race_results(driver_id, points DESC, race_id);
+CREATE INDEX IF NOT EXISTS idx_races_season_round ON races(season, round_number, championship_id);
+CREATE INDEX IF NOT EXISTS idx_teams_disc_tier ON teams(discipline_id, tier_id, id);
 """
\ No newline at end of file
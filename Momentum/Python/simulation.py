@@ -3,21 +3,92 @@ Enhanced FastAPI simulation server with database integration.
 Main entry point for the Momentum simulation backend.
 """
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import numpy as np
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Any, Optional
 import uvicorn
 
 from database.database_manager import DatabaseManager
-from database.models import Driver, Team, Track, Championship, Race
+from database.models import Driver, Team, Track, Championship, Race, Discipline
 from core.race_simulation import RaceSimulator, SimulationContext
 from config import API_HOST, API_PORT, API_RELOAD
 
+class Participant(BaseModel):
+    """A driver/team pairing entered in a race"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    driver_id: int
+    team_id: int
+
+class SimulateRaceRequest(BaseModel):
+    """Body of POST /simulate/race; validated in pydantic-core (Rust)"""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    race_id: int = 1
+    weather_conditions: str = "dry"
+    participants: List[Participant] = []
+
+def score_grid(driver_ids: np.ndarray, team_ids: np.ndarray) -> np.ndarray:
+    """Points for a finishing order, computed for the whole grid at once"""
+    return np.maximum(0, 25 - 2 * np.arange(len(driver_ids), dtype=np.int32))
+
+def _run_simulation(race_id: int, weather: str, participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """CPU-bound race scoring; module-level so it pickles to worker processes"""
+    # Test simulation result for now; the Monte Carlo engine plugs in here.
+    # Results are columnar (one array per field) rather than a list of dicts:
+    # NumPy scores the whole grid in one pass and orjson serializes flat
+    # lists far faster than repeated per-driver objects.
+    grid = participants[:10] if participants else [{}] * 5
+    n = len(grid)
+    driver_ids = np.fromiter(
+        (p.get("driver_id", i) for i, p in enumerate(grid)), dtype=np.int32, count=n)
+    team_ids = np.fromiter(
+        (p.get("team_id", i) for i, p in enumerate(grid)), dtype=np.int32, count=n)
+    positions = np.arange(1, n + 1, dtype=np.int32)
+    points = score_grid(driver_ids, team_ids)
+    return {
+        "driver_id": driver_ids.tolist(),
+        "team_id": team_ids.tolist(),
+        "position": positions.tolist(),
+        "points": points.tolist(),
+        "fastest_lap": (positions == 1).tolist(),
+    }
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the database manager and workers at startup; release on shutdown"""
+    app.state.db_manager = DatabaseManager()
+    app.state.race_simulator = RaceSimulator()
+    app.state.db_manager.get_database_stats()  # warms the pool and page cache
+    app.state.executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    yield
+    app.state.executor.shutdown()
+    app.state.db_manager.close()
+
+def get_db(request: Request) -> DatabaseManager:
+    """Dependency: the lifespan-owned database manager (pooled connections)"""
+    return request.app.state.db_manager
+
+def get_simulator(request: Request) -> RaceSimulator:
+    """Dependency: the lifespan-owned race simulator"""
+    return request.app.state.race_simulator
+
 app = FastAPI(
     title="Momentum Simulation API",
     description="Multi-discipline Motorsport Management Simulator Backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Enable CORS for Unity frontend
@@ -29,101 +100,164 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global instances
-db_manager = DatabaseManager()
-race_simulator = RaceSimulator()
+# Compress large JSON payloads (full driver/team dumps) before they hit the
+# wire; level 5 trades a little ratio for much lower CPU than the default 9
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Static payloads serialized once at import; these endpoints are hit by
+# probes constantly and their content never changes at runtime
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": "Momentum Simulation API",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "health": "/health",
+        "liveness": "/livez",
+        "readiness": "/readyz",
+        "database_stats": "/stats",
+        "drivers": "/drivers",
+        "teams": "/teams",
+        "bootstrap": "/bootstrap",
+        "simulate_race": "/simulate/race"
+    }
+})
+_TEST_PAYLOAD = orjson.dumps({"message": "Simulation test successful."})
+
+def _stream_json_list(rows, key: str):
+    """Yield a {key: [...]} JSON document one record at a time.
+
+    Rows are serialized as they come off the database cursor, so memory
+    stays flat however large the table grows and the first bytes reach
+    the client at first-row latency.
+    """
+    yield b'{"%s":[' % key.encode()
+    first = True
+    for row in rows:
+        if not first:
+            yield b","
+        yield orjson.dumps(row)
+        first = False
+    yield b"]}"
 
 @app.get("/")
 def root():
     """Root endpoint with API information"""
-    return {
-        "message": "Momentum Simulation API",
-        "version": "1.0.0",
-        "status": "running",
-        "endpoints": {
-            "health": "/health",
-            "database_stats": "/stats",
-            "drivers": "/drivers",
-            "teams": "/teams",
-            "simulate_race": "/simulate/race"
-        }
-    }
+    return Response(_ROOT_PAYLOAD, media_type="application/json")
+
+_LIVEZ_PAYLOAD = orjson.dumps({"status": "ok"})
+
+@app.get("/livez")
+def livez():
+    """Liveness probe; constant payload, touches nothing"""
+    return Response(_LIVEZ_PAYLOAD, media_type="application/json")
+
+@app.get("/readyz")
+def readyz(db: DatabaseManager = Depends(get_db)):
+    """Readiness probe; a cached SELECT 1, not the full stats scan"""
+    try:
+        db.ping()
+        return Response(_LIVEZ_PAYLOAD, media_type="application/json")
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Database not ready: {str(e)}")
 
 @app.get("/health")
-def health_check():
-    """Health check endpoint"""
+def health_check(db: DatabaseManager = Depends(get_db)):
+    """Legacy health check; cheap like /readyz, without the COUNT(*) scans"""
     try:
-        stats = db_manager.get_database_stats()
+        db.ping()
         return {
             "status": "healthy",
-            "database": "connected",
-            "stats": stats
+            "database": "connected"
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 @app.get("/stats")
-def get_database_stats():
+def get_database_stats(db: DatabaseManager = Depends(get_db)):
     """Get database statistics"""
     try:
-        stats = db_manager.get_database_stats()
-        return JSONResponse(content={"database_stats": stats})
+        stats = db.get_database_stats()
+        return ORJSONResponse({"database_stats": stats})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 @app.get("/drivers")
-def get_all_drivers():
-    """Get all drivers"""
+def get_all_drivers(db: DatabaseManager = Depends(get_db)):
+    """Get all drivers (streamed)"""
+    # orjson serializes each dataclass natively in C; the full list is
+    # never materialized server-side
+    return StreamingResponse(_stream_json_list(db.iter_drivers(), "drivers"),
+                             media_type="application/json")
+
+@app.get("/drivers.bin")
+def get_all_drivers_binary(db: DatabaseManager = Depends(get_db)):
+    """Raw structured-array dump of driver attributes for vectorized clients"""
     try:
-        drivers = db_manager.get_all_drivers()
-        return JSONResponse(content={
-            "drivers": [driver.__dict__ for driver in drivers],
-            "count": len(drivers)
-        })
+        drivers = db.get_all_drivers_array()
+        return Response(
+            content=drivers.tobytes(),
+            media_type="application/octet-stream",
+            headers={
+                "X-Momentum-Dtype": str(drivers.dtype.descr),
+                "X-Momentum-Count": str(len(drivers)),
+            }
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get drivers: {str(e)}")
 
 @app.get("/teams")
-def get_teams(discipline: Optional[str] = None):
-    """Get teams, optionally filtered by discipline"""
+def get_teams(discipline: Optional[str] = None, db: DatabaseManager = Depends(get_db)):
+    """Get teams, optionally filtered by discipline (streamed)"""
+    if discipline:
+        # Validate before the stream starts; a bad label raising
+        # mid-generator would truncate an already-started 200 response
+        try:
+            Discipline.from_label(discipline)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        teams = db.iter_teams_by_discipline(discipline)
+    else:
+        teams = db.iter_teams()
+    return StreamingResponse(_stream_json_list(teams, "teams"),
+                             media_type="application/json")
+
+@app.get("/bootstrap")
+async def bootstrap(db: DatabaseManager = Depends(get_db)):
+    """Everything a client needs at startup in one round-trip"""
     try:
-        if discipline:
-            teams = db_manager.get_teams_by_discipline(discipline)
-        else:
-            teams = []  # TODO: Implement get_all_teams method
-        
-        return JSONResponse(content={
-            "teams": [team.__dict__ for team in teams],
-            "count": len(teams),
-            "discipline": discipline
+        # The three table reads run concurrently on the thread pool; WAL
+        # lets the pooled connections serve them in parallel
+        loop = asyncio.get_running_loop()
+        drivers, teams, tracks = await asyncio.gather(
+            loop.run_in_executor(None, db.get_all_drivers),
+            loop.run_in_executor(None, db.get_all_teams),
+            loop.run_in_executor(None, db.get_all_tracks))
+        return ORJSONResponse({
+            "drivers": drivers,
+            "teams": teams,
+            "tracks": tracks
         })
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get teams: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to bootstrap: {str(e)}")
 
 @app.post("/simulate/race")
-def simulate_race(request: Dict[str, Any]):
+async def simulate_race(request: SimulateRaceRequest):
     """Simulate a race with given parameters"""
     try:
-        race_id = request.get("race_id", 1)
-        weather = request.get("weather_conditions", "dry")
-        participants = request.get("participants", [])
-        
-        # Return test simulation result for now
-        results = [
-            {
-                "driver_id": p.get("driver_id", i),
-                "team_id": p.get("team_id", i),
-                "position": i + 1,
-                "points": max(0, 25 - i * 2),
-                "fastest_lap": i == 0
-            }
-            for i, p in enumerate(participants[:10] if participants else range(5))
-        ]
-        
-        return JSONResponse(content={
-            "race_id": race_id,
-            "weather": weather,
+        participants = [p.model_dump() for p in request.participants]
+
+        # CPU-bound work runs in a worker process so concurrent simulation
+        # requests scale across cores instead of blocking the event loop
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            app.state.executor, _run_simulation,
+            request.race_id, request.weather_conditions, participants)
+
+        return ORJSONResponse({
+            "race_id": request.race_id,
+            "weather": request.weather_conditions,
             "results": results,
+            "count": len(results["position"]),
             "simulation_status": "completed"
         })
         
@@ -133,12 +267,24 @@ def simulate_race(request: Dict[str, Any]):
 @app.get("/test")
 def test_endpoint():
     """Legacy test endpoint"""
-    return JSONResponse(content={"message": "Simulation test successful."})
+    return Response(_TEST_PAYLOAD, media_type="application/json")
 
 if __name__ == "__main__":
+    # One worker per core; each worker imports this module fresh and so
+    # gets its own SQLitePool and process executor (WAL handles the
+    # cross-process readers/writer mix). uvloop + httptools replace the
+    # stdlib event loop and the pure-Python HTTP parser. Reload needs the
+    # single-process supervisor and would silently override a worker
+    # count, so setting WEB_CONCURRENCY disables reload and reload runs
+    # exactly one worker.
+    reload = API_RELOAD and not os.environ.get("WEB_CONCURRENCY")
+    workers = 1 if reload else int(os.environ.get("WEB_CONCURRENCY", os.cpu_count()))
     uvicorn.run(
         "simulation:app",
         host=API_HOST,
         port=API_PORT,
-        reload=API_RELOAD
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        reload=reload
     )